@@ -15,31 +15,142 @@ Fully async for high concurrency.
 
 import asyncio
 import aiohttp
-from typing import Dict, Any, List, Optional
+import contextlib
+import itertools
+import re
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Any, List, Optional
 import logging
-from bs4 import BeautifulSoup
 from playwright.async_api import async_playwright
 import trafilatura
-from urllib.parse import urljoin
+from lxml import etree, html as lxml_html
+from lxml.cssselect import CSSSelector
+from urllib.parse import urljoin, urlparse
 import os
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Subresources that never contribute text, aborted in browser contexts
+BLOCKED_RESOURCE_TYPES = {'image', 'media', 'font', 'stylesheet'}
+
+async def _block_heavy_resources(route):
+    """Playwright route handler dropping non-text subresources"""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+# Scrapes after which a pooled context is discarded: cookies are cleared on every
+# checkin, but localStorage, IndexedDB and the HTTP cache persist until then
+MAX_CONTEXT_USES = 10
+
+def _site_host(url: str) -> str:
+    """Hostname without port or a leading www."""
+    host = urlparse(url).hostname or ''
+    return host[4:] if host.startswith('www.') else host
+
+def _left_site(start_url: str, final_url: str) -> bool:
+    """True when a redirect moved off the requested site (subdomains such as en. count as same site)"""
+    start, final = _site_host(start_url), _site_host(final_url)
+    return not (start == final or final.endswith('.' + start) or start.endswith('.' + final))
+
+# Compiled once: candidate containers for the main page content
+MAIN_CONTENT_SELECTOR = CSSSelector('main, article, .content, .post, #content')
+
+# Static extraction needs more words than this before the browser levels are skipped
+MIN_WORD_COUNT = 100
+_WORD_RE = re.compile(r'\S+')
+
+def _word_count(text: str) -> int:
+    """Count words lazily, stopping just past MIN_WORD_COUNT"""
+    return sum(1 for _ in itertools.islice(_WORD_RE.finditer(text), MIN_WORD_COUNT + 1))
+
+# Raw HTML tokens: runs of tags, comments, whitespace and non-text blocks are skipped,
+# group 1 is visible text. Block bodies use an unrolled loop, not a lazy .*?
+_HTML_TOKEN_RE = re.compile(
+    r'(?:' + '|'.join(
+        rf'<{tag}\b[^<]*(?:<(?!/{tag}\s*>)[^<]*)*</{tag}\s*>'
+        for tag in ('script', 'style', 'noscript', 'template')
+    ) + r'|<!--.*?-->|<[^>]*>|\s+)+|([^<]+)',
+    re.IGNORECASE | re.DOTALL,
+)
+
+def _looks_thin(html: str) -> bool:
+    """Cheap pre-parse guess that static extraction will come up short"""
+    # Same word threshold as Level 2, stopping as soon as the page has enough text
+    words = 0
+    for match in _HTML_TOKEN_RE.finditer(html):
+        text = match.group(1)
+        if text:
+            words += _word_count(text)
+            if words > MIN_WORD_COUNT:
+                return False
+    return True
+
+# Documents above this many characters are not handed to Trafilatura
+MAX_EXTRACT_SIZE = 8_000_000
+
+def _parse_html(html: str):
+    """Parse HTML into an lxml tree"""
+    try:
+        return lxml_html.fromstring(html)
+    except ValueError:
+        # lxml rejects str input that carries an XML encoding declaration
+        return lxml_html.fromstring(html.encode('utf-8'))
+
+def _extract_text(html: str) -> Optional[str]:
+    """Trafilatura extraction on a single, size-bounded lxml parse"""
+    if len(html) > MAX_EXTRACT_SIZE:
+        logger.warning(f"Skipping Trafilatura on {len(html)} chars of HTML")
+        return None
+    return trafilatura.extract(
+        _parse_html(html),
+        favor_precision=True,
+        include_formatting=False,
+        include_comments=False,
+        include_tables=False,
+        fast=True,
+    )
+
 class FallbackScraper:
     """Progressive fallback scraping strategy"""
     
-    def __init__(self, max_retries: int = 3, timeout: int = 30):
+    def __init__(
+        self,
+        max_retries: int = 3,
+        timeout: int = 30,
+        pool_size: int = 4,
+        get_browser: Optional[Callable[[], Awaitable[Any]]] = None
+    ):
         self.max_retries = max_retries
         self.timeout = timeout
         self.session: Optional[aiohttp.ClientSession] = None
         self.playwright = None
+        self._browser_headless = None
+        self._browser_headful = None
+        self._browser_lock = asyncio.Lock()
+        # Caller-owned headless browser getter; such a browser is never closed here
+        self._get_shared_browser = get_browser
+        # Warm headless contexts, reused across URLs; slots bound pages in flight
+        self._context_pool: asyncio.Queue = asyncio.Queue()
+        self._context_slots = asyncio.Semaphore(pool_size)
+        self._context_uses: Dict[Any, int] = {}
     
     async def setup_session(self) -> aiohttp.ClientSession:
         """Setup persistent aiohttp session"""
         if not self.session:
-            connector = aiohttp.TCPConnector(limit=100, limit_per_host=20, ttl_dns_cache=300)
+            try:
+                resolver = aiohttp.AsyncResolver()
+            except RuntimeError:  # aiodns missing, or Proactor loop on Windows
+                resolver = aiohttp.ThreadedResolver()
+            connector = aiohttp.TCPConnector(
+                limit=100, limit_per_host=20, use_dns_cache=True, ttl_dns_cache=300, resolver=resolver
+            )
             timeout = aiohttp.ClientTimeout(total=self.timeout)
             self.session = aiohttp.ClientSession(
                 connector=connector,
@@ -59,79 +170,185 @@ class FallbackScraper:
         """Close aiohttp session"""
         if self.session:
             await self.session.close()
+            self.session = None
     
     async def close_playwright(self):
-        """Close Playwright instance"""
+        """Close pooled contexts, shared browsers and the Playwright instance"""
+        while not self._context_pool.empty():
+            with contextlib.suppress(Exception):
+                await self._context_pool.get_nowait().close()
+        self._context_uses.clear()
+        if self._browser_headless and self._get_shared_browser is None:
+            await self._browser_headless.close()
+        if self._browser_headful:
+            await self._browser_headful.close()
+        self._browser_headless = None
+        self._browser_headful = None
         if self.playwright:
             await self.playwright.stop()
+            self.playwright = None
+    
+    async def _get_browser(self, headful: bool = False):
+        """Return the shared browser for the mode, launching it on first use"""
+        if not headful and self._get_shared_browser is not None:
+            self._browser_headless = await self._get_shared_browser()
+            return self._browser_headless
+        async with self._browser_lock:
+            if not self.playwright:
+                self.playwright = await async_playwright().start()
+            if headful:
+                if not self._browser_headful or not self._browser_headful.is_connected():
+                    self._browser_headful = await self.playwright.chromium.launch(headless=False)
+                return self._browser_headful
+            if not self._browser_headless or not self._browser_headless.is_connected():
+                self._browser_headless = await self.playwright.chromium.launch(headless=True)
+            return self._browser_headless
     
-    async def _http_request(self, url: str) -> Dict[str, Any]:
+    async def _new_context(self, browser):
+        """Create a browser context with scraper UA/viewport and resource blocking"""
+        context = await browser.new_context(
+            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            viewport={'width': 1920, 'height': 1080}
+        )
+        await context.route("**/*", _block_heavy_resources)
+        return context
+    
+    async def _checkout_context(self):
+        """Take an idle headless context from the pool, creating one if none is idle"""
+        await self._context_slots.acquire()
+        try:
+            while not self._context_pool.empty():
+                context = self._context_pool.get_nowait()
+                if context.browser and context.browser.is_connected():
+                    return context
+                self._context_uses.pop(context, None)
+            return await self._new_context(await self._get_browser())
+        except BaseException:
+            self._context_slots.release()
+            raise
+    
+    async def _checkin_context(self, context):
+        """Return a context to the pool with its cookies cleared.
+
+        Other per-origin state (localStorage, IndexedDB, HTTP cache) is shared by
+        the scrapes a context serves, so it is closed after MAX_CONTEXT_USES.
+        """
+        try:
+            uses = self._context_uses.pop(context, 0) + 1
+            if uses >= MAX_CONTEXT_USES:
+                await context.close()
+                return
+            await context.clear_cookies()
+            self._context_uses[context] = uses
+            self._context_pool.put_nowait(context)
+        except Exception:
+            pass  # Context went away with its browser; a new one is made on demand
+        finally:
+            self._context_slots.release()
+    
+    def _retry_delay(self, headers) -> Optional[float]:
+        """Backoff requested via Retry-After / X-RateLimit-* headers, capped at the timeout"""
+        delay = None
+        retry_after = headers.get('Retry-After')
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                try:
+                    delay = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+                except (TypeError, ValueError):
+                    pass
+        elif headers.get('X-RateLimit-Remaining') == '0' and headers.get('X-RateLimit-Reset'):
+            try:
+                reset = float(headers['X-RateLimit-Reset'])
+                # Either an epoch timestamp or seconds until the window resets
+                delay = reset - time.time() if reset > 1e9 else reset
+            except ValueError:
+                pass
+        if delay is None:
+            return None
+        return min(max(delay, 0.0), self.timeout)
+    
+    async def _http_request(self, url: str, max_retries: Optional[int] = None) -> Dict[str, Any]:
         """Level 1: Plain HTTP request"""
-        for attempt in range(self.max_retries):
+        if max_retries is None:
+            max_retries = self.max_retries
+        for attempt in range(max_retries):
+            delay = None
             try:
-                async with await self.setup_session() as session:
-                    async with session.get(url) as response:
-                        if response.status == 200:
-                            content = await response.text()
-                            if content.strip():  # Check for non-empty
-                                return {
-                                    'method': 'http',
-                                    'content': content,
-                                    'status': 'success',
-                                    'headers': dict(response.headers)
-                                }
-                            else:
-                                logger.warning(f"Empty response from {url}")
+                session = await self.setup_session()
+                async with session.get(url) as response:
+                    if response.status == 200:
+                        # Decode the raw body ourselves: no charset sniffing for undeclared encodings
+                        raw = await response.read()
+                        try:
+                            content = raw.decode(response.charset or 'utf-8')
+                        except (LookupError, UnicodeDecodeError):
+                            content = raw.decode('utf-8', errors='replace')
+                        if content.strip():  # Check for non-empty
+                            return {
+                                'method': 'http',
+                                'content': content,
+                                'status': 'success',
+                                'headers': dict(response.headers)
+                            }
                         else:
-                            logger.warning(f"HTTP {response.status} for {url}")
-                            if attempt == self.max_retries - 1:
-                                return {'method': 'http', 'status': 'error', 'error': f'HTTP {response.status}'}
-                await asyncio.sleep(1 * (attempt + 1))  # Exponential backoff
+                            logger.warning(f"Empty response from {url}")
+                    else:
+                        logger.warning(f"HTTP {response.status} for {url}")
+                        if attempt == max_retries - 1:
+                            return {'method': 'http', 'status': 'error', 'error': f'HTTP {response.status}'}
+                        delay = self._retry_delay(response.headers)
+                # Honor server-requested backoff, otherwise exponential backoff
+                await asyncio.sleep(delay if delay is not None else 1 * (attempt + 1))
             except Exception as e:
                 logger.error(f"HTTP attempt {attempt+1} failed for {url}: {str(e)}")
-                if attempt == self.max_retries - 1:
+                if attempt == max_retries - 1:
                     return {'method': 'http', 'status': 'error', 'error': str(e)}
         return {'method': 'http', 'status': 'error'}
     
     async def _beautifulsoup_parse(self, url: str, html: str) -> Dict[str, Any]:
-        """Level 2: BeautifulSoup parsing and content extraction"""
+        """Level 2: static extraction, run in a worker thread to keep the loop free"""
+        return await asyncio.to_thread(self._parse_static, html)
+    
+    def _parse_static(self, html: str) -> Dict[str, Any]:
+        """Trafilatura extraction, lxml text parsing as fallback"""
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Remove script/style
-            for script in soup(["script", "style", "nav", "footer"]):
-                script.decompose()
-            
-            # Try to find main content
-            main_selectors = ['main', 'article', '.content', '.post', '#content']
-            main_content = None
-            for selector in main_selectors:
-                main_content = soup.select_one(selector)
-                if main_content:
-                    break
-            
-            if not main_content:
-                main_content = soup.body if soup.body else soup
-            
-            text = main_content.get_text(separator='\n', strip=True)
-            
-            # Use Trafilatura for better extraction if available
+            # Trafilatura first: when it succeeds the fallback tree is never needed
             try:
-                extracted = trafilatura.extract(html, favor_precision=True, include_formatting=False)
-                if extracted:
-                    text = extracted
+                extracted = _extract_text(html)
+                if extracted and extracted.strip():
                     logger.info("Used Trafilatura for extraction")
-            except ImportError:
-                logger.warning("Trafilatura not available, using BS4")
+                    return {
+                        'method': 'trafilatura',
+                        'content': extracted,
+                        'status': 'success',
+                        'word_count': _word_count(extracted)
+                    }
             except Exception as e:
                 logger.warning(f"Trafilatura failed: {e}")
             
+            tree = _parse_html(html)
+            
+            # Remove script/style (and comments) in one C-level pass
+            etree.strip_elements(tree, etree.Comment, 'script', 'style', 'nav', 'footer', with_tail=False)
+            
+            # Try to find main content in a single selector pass
+            matches = MAIN_CONTENT_SELECTOR(tree)
+            if matches:
+                main_content = matches[0]
+            else:
+                body = tree.find('.//body')
+                main_content = body if body is not None else tree
+            
+            text = '\n'.join(t.strip() for t in main_content.itertext() if t.strip())
+            
             if text.strip():
                 return {
                     'method': 'beautifulsoup',
                     'content': text,
                     'status': 'success',
-                    'word_count': len(text.split())
+                    'word_count': _word_count(text)
                 }
             else:
                 return {'method': 'beautifulsoup', 'status': 'empty_content'}
@@ -142,30 +359,27 @@ class FallbackScraper:
     
     async def _headless_browser(self, url: str) -> Dict[str, Any]:
         """Level 3: Headless Playwright"""
-        playwright = await async_playwright().start()
-        browser = None
+        context = None
+        page = None
         try:
-            browser = await playwright.chromium.launch(headless=True)
-            context = await browser.new_context(
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                viewport={'width': 1920, 'height': 1080}
-            )
+            context = await self._checkout_context()
             page = await context.new_page()
             
             # Navigate with wait
             await page.goto(url, wait_until='domcontentloaded', timeout=30000)
             await page.wait_for_timeout(2000)  # Allow JS to run
             
+            html = await page.content()
+            
             # Check for bot detection or errors
-            if 'captcha' in await page.content().lower() or page.url != urlparse(url).netloc:
+            if 'captcha' in html.lower() or _left_site(url, page.url):
                 return {'method': 'headless', 'status': 'bot_detected'}
             
-            html = await page.content()
             text = await page.text_content('body')
             
             # Trafilatura on HTML
             try:
-                extracted = trafilatura.extract(html, favor_precision=True, include_formatting=False)
+                extracted = _extract_text(html)
                 if extracted:
                     text = extracted
             except Exception as e:
@@ -177,7 +391,7 @@ class FallbackScraper:
                     'content': text,
                     'status': 'success',
                     'url': page.url,
-                    'word_count': len(text.split())
+                    'word_count': _word_count(text)
                 }
             else:
                 return {'method': 'headless', 'status': 'empty_content'}
@@ -186,33 +400,32 @@ class FallbackScraper:
             logger.error(f"Headless browser failed: {str(e)}")
             return {'method': 'headless', 'status': 'error', 'error': str(e)}
         finally:
-            if browser:
-                await browser.close()
-            await playwright.stop()
+            if context:
+                if page:
+                    with contextlib.suppress(Exception):
+                        await page.close()
+                await self._checkin_context(context)
     
     async def _headful_browser(self, url: str) -> Dict[str, Any]:
         """Level 4: Headful Playwright (last resort)"""
-        playwright = await async_playwright().start()
-        browser = None
+        context = None
         try:
-            browser = await playwright.chromium.launch(headless=False, slow_mo=500)
-            context = await browser.new_context(
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                viewport={'width': 1920, 'height': 1080}
-            )
+            browser = await self._get_browser(headful=True)
+            context = await self._new_context(browser)
             page = await context.new_page()
             
-            await page.goto(url, wait_until='networkidle', timeout=60000)
-            
-            # Wait longer for manual-like interaction
-            await page.wait_for_timeout(5000)
+            await page.goto(url, wait_until='domcontentloaded', timeout=30000)
+            try:
+                await page.wait_for_selector('main, article, body', timeout=5000)
+            except Exception:
+                pass  # Some pages never attach a body in time; read what is there
             
             html = await page.content()
             text = await page.text_content('body')
             
             # Trafilatura
             try:
-                extracted = trafilatura.extract(html, favor_precision=True, include_formatting=False)
+                extracted = _extract_text(html)
                 if extracted:
                     text = extracted
             except Exception as e:
@@ -224,7 +437,7 @@ class FallbackScraper:
                     'content': text,
                     'status': 'success',
                     'url': page.url,
-                    'word_count': len(text.split())
+                    'word_count': _word_count(text)
                 }
             else:
                 return {'method': 'headful', 'status': 'empty_content'}
@@ -233,11 +446,10 @@ class FallbackScraper:
             logger.error(f"Headful browser failed: {str(e)}")
             return {'method': 'headful', 'status': 'error', 'error': str(e)}
         finally:
-            if browser:
-                await browser.close()
-            await playwright.stop()
+            if context:
+                await context.close()
     
-    async def scrape_with_fallback(self, url: str) -> Dict[str, Any]:
+    async def scrape_with_fallback(self, url: str, max_retries: Optional[int] = None) -> Dict[str, Any]:
         """
         Main scraping method with progressive fallbacks
         
@@ -247,75 +459,104 @@ class FallbackScraper:
         - Bot protection indicators (captcha, blocked)
         - JS-rendered content (no main tags in HTML)
         
+        Args:
+            url: URL to scrape
+            max_retries: HTTP attempts for this call, defaults to the scraper's
+        
         Returns:
             Best available content or error
         """
-        # Level 1: HTTP
-        http_result = await self._http_request(url)
-        if http_result['status'] == 'success':
-            bs_result = await self._beautifulsoup_parse(url, http_result['content'])
-            if bs_result['status'] == 'success' and bs_result['word_count'] > 100:
-                await self.close_session()
+        headless_task = None
+        try:
+            # Level 1: HTTP
+            http_result = await self._http_request(url, max_retries)
+            if http_result['status'] == 'success':
+                # Once the headless browser is warm, start Level 3 speculatively for
+                # pages with too little visible text, so page load overlaps with static
+                # parsing; cold runs and text-rich pages never hit the host twice
+                if self._browser_headless is not None and await asyncio.to_thread(_looks_thin, http_result['content']):
+                    headless_task = asyncio.create_task(self._headless_browser(url))
+                bs_result = await self._beautifulsoup_parse(url, http_result['content'])
+                if bs_result['status'] == 'success' and bs_result['word_count'] > MIN_WORD_COUNT:
+                    return {
+                        'url': url,
+                        'method_used': 'http+bs',
+                        'content': bs_result['content'],
+                        'extraction_notes': 'Clean text via BeautifulSoup + Trafilatura',
+                        'status': 'success'
+                    }
+            
+            # Level 2: If BS failed or empty, but HTTP succeeded, retry BS? Already did.
+            
+            # Level 3: Headless
+            headless_result = await (headless_task or self._headless_browser(url))
+            if headless_result['status'] == 'success':
                 return {
                     'url': url,
-                    'method_used': 'http+bs',
-                    'content': bs_result['content'],
-                    'extraction_notes': 'Clean text via BeautifulSoup + Trafilatura',
+                    'method_used': 'headless_browser',
+                    'content': headless_result['content'],
+                    'extraction_notes': 'JS-rendered via Playwright + Trafilatura',
                     'status': 'success'
                 }
-        
-        # Level 2: If BS failed or empty, but HTTP succeeded, retry BS? Already did.
-        
-        # Level 3: Headless
-        headless_result = await self._headless_browser(url)
-        if headless_result['status'] == 'success':
-            await self.close_session()
-            return {
-                'url': url,
-                'method_used': 'headless_browser',
-                'content': headless_result['content'],
-                'extraction_notes': 'JS-rendered via Playwright + Trafilatura',
-                'status': 'success'
-            }
-        
-        # Level 4: Headful
-        headful_result = await self._headful_browser(url)
-        if headful_result['status'] == 'success':
-            await self.close_session()
+            
+            # Level 4: Headful
+            headful_result = await self._headful_browser(url)
+            if headful_result['status'] == 'success':
+                return {
+                    'url': url,
+                    'method_used': 'headful_browser',
+                    'content': headful_result['content'],
+                    'extraction_notes': 'Interactive via headful Playwright + Trafilatura',
+                    'status': 'success'
+                }
+            
             return {
                 'url': url,
-                'method_used': 'headful_browser',
-                'content': headful_result['content'],
-                'extraction_notes': 'Interactive via headful Playwright + Trafilatura',
-                'status': 'success'
+                'method_used': 'failed_all',
+                'content': '',
+                'status': 'error',
+                'error': 'All fallback methods failed'
             }
-        
-        await self.close_session()
-        return {
-            'url': url,
-            'method_used': 'failed_all',
-            'content': '',
-            'status': 'error',
-            'error': 'All fallback methods failed'
-        }
+        finally:
+            # Unused speculative load, or the caller was cancelled mid-scrape
+            if headless_task and not headless_task.done():
+                headless_task.cancel()
+                await asyncio.wait([headless_task])
 
-async def scrape_multiple(urls: List[str], max_concurrent: int = 10) -> List[Dict[str, Any]]:
-    """Concurrent scraping with semaphore for rate limiting"""
+async def scrape_multiple(
+    urls: List[str],
+    max_concurrent: int = 10,
+    max_per_host: int = 4,
+    scraper: Optional[FallbackScraper] = None
+) -> List[Dict[str, Any]]:
+    """Concurrent scraping with global and per-host semaphores for rate limiting"""
     semaphore = asyncio.Semaphore(max_concurrent)
-    scraper = FallbackScraper()
+    host_semaphores = defaultdict(lambda: asyncio.Semaphore(max_per_host))
+    # A caller-provided scraper is shared and stays open
+    owns_scraper = scraper is None
+    if owns_scraper:
+        scraper = FallbackScraper(pool_size=min(max_concurrent, 4))
     
     async def bounded_scrape(url):
-        async with semaphore:
-            return await scraper.scrape_with_fallback(url)
-    
-    tasks = [bounded_scrape(u) for u in urls]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Take the host slot first so waiting on a busy host holds no global slot
+        async with host_semaphores[urlparse(url).netloc], semaphore:
+            try:
+                return await scraper.scrape_with_fallback(url)
+            except Exception as e:
+                # Drop the failed URL without cancelling the rest of the group
+                logger.warning(f"Scraping {url} failed: {e}")
+                return None
     
-    await scraper.close_session()
-    await scraper.close_playwright()
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(bounded_scrape(u)) for u in urls]
+    finally:
+        if owns_scraper:
+            await scraper.close_session()
+            await scraper.close_playwright()
     
-    # Filter exceptions
-    return [r for r in results if not isinstance(r, Exception)]
+    # Filter failures
+    return [r for r in (t.result() for t in tasks) if r is not None]
 
 # Example usage
 if __name__ == "__main__":
@@ -329,5 +570,6 @@ if __name__ == "__main__":
         else:
             print(f"Failed: {result.get('error', 'Unknown error')}")
         await scraper.close_session()
+        await scraper.close_playwright()
     
     asyncio.run(main())
@@ -15,45 +15,65 @@ Key features:
 
 import asyncio
 import aiohttp
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from typing import List, Dict, Any, Optional
 import logging
-from urllib.parse import quote, urljoin, urlparse
+import orjson
+from urllib.parse import parse_qs, quote, urljoin, urlparse
 import trafilatura  # For content extraction if needed in search results
 
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # selectolax is optional, BeautifulSoup is used instead
+    LexborHTMLParser = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def create_session(limit_per_host: int = 30) -> aiohttp.ClientSession:
+    """Create an HTTP session with headers to mimic browser"""
+    try:
+        resolver = aiohttp.AsyncResolver()
+    except RuntimeError:  # aiodns missing, or Proactor loop on Windows
+        resolver = aiohttp.ThreadedResolver()
+    connector = aiohttp.TCPConnector(
+        limit=100, limit_per_host=limit_per_host, use_dns_cache=True, ttl_dns_cache=300, resolver=resolver
+    )
+    timeout = aiohttp.ClientTimeout(total=30)
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout,
+        headers={
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.5',
+            'Accept-Encoding': 'gzip, deflate, br',
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1',
+        }
+    )
+
 class SearchEngine:
     """Base class for search engines"""
     
-    def __init__(self):
-        self.session: Optional[aiohttp.ClientSession] = None
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
+        self.session = session
+        # An injected session belongs to the caller and is not closed here
+        self._owns_session = session is None
     
     async def setup_session(self) -> aiohttp.ClientSession:
         """Setup HTTP session with headers to mimic browser"""
         if not self.session:
-            connector = aiohttp.TCPConnector(limit=100, limit_per_host=30)
-            timeout = aiohttp.ClientTimeout(total=30)
-            self.session = aiohttp.ClientSession(
-                connector=connector,
-                timeout=timeout,
-                headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                    'Accept-Language': 'en-US,en;q=0.5',
-                    'Accept-Encoding': 'gzip, deflate, br',
-                    'Connection': 'keep-alive',
-                    'Upgrade-Insecure-Requests': '1',
-                }
-            )
+            self.session = create_session()
+            self._owns_session = True
         return self.session
     
     async def close_session(self):
         """Close the HTTP session"""
-        if self.session:
+        if self.session and self._owns_session:
             await self.session.close()
+            self.session = None
     
     async def search(self, query: str, num_results: int = 10) -> Dict[str, Any]:
         """
@@ -75,39 +95,44 @@ class GoogleSearchEngine(SearchEngine):
         """Scrape Google search results for URLs"""
         try:
             search_url = f"https://www.google.com/search?q={quote(query)}&num={num_results}"
-            async with await self.setup_session() as session:
-                async with session.get(search_url) as response:
-                    if response.status == 200:
-                        html = await response.text()
-                        soup = BeautifulSoup(html, 'html.parser')
-                        
-                        urls = []
-                        # Extract organic results
-                        for g in soup.find_all('div', class_='g')[:num_results]:
-                            a = g.find('a')
-                            if a and a.get('href'):
-                                href = a['href']
-                                if href.startswith('/url?q='):
-                                    # Decode Google redirect
-                                    from urllib.parse import parse_qs, urlparse
-                                    parsed = urlparse(href)
-                                    actual_url = parse_qs(parsed.query)['q'][0]
-                                    urls.append(actual_url)
-                                else:
-                                    urls.append(href)
-                        
-                        if urls:
-                            return {
-                                'engine': 'google',
-                                'urls': urls[:num_results],
-                                'status': 'success'
-                            }
-                        else:
-                            return {'engine': 'google', 'urls': [], 'status': 'partial'}
+            session = await self.setup_session()
+            async with session.get(search_url) as response:
+                if response.status == 200:
+                    html = await response.text()
+                    if LexborHTMLParser is not None:
+                        results = LexborHTMLParser(html).css('div.g')[:num_results]
+                        anchors = [g.css_first('a') for g in results]
+                        hrefs = [a.attributes.get('href') for a in anchors if a is not None]
                     else:
-                        logger.warning(f"Google search HTTP {response.status}")
-                        return {'engine': 'google', 'urls': [], 'status': 'error'}
-                        
+                        # Only build the organic result blocks, not the whole page
+                        strainer = SoupStrainer('div', class_='g')
+                        soup = BeautifulSoup(html, 'lxml', parse_only=strainer)
+                        anchors = [g.find('a') for g in soup.find_all('div', class_='g')[:num_results]]
+                        hrefs = [a.get('href') for a in anchors if a is not None]
+                    
+                    urls = []
+                    # Extract organic results
+                    for href in hrefs:
+                        if href:
+                            if href.startswith('/url?q='):
+                                # Decode Google redirect
+                                actual_url = parse_qs(urlparse(href).query)['q'][0]
+                                urls.append(actual_url)
+                            else:
+                                urls.append(href)
+                    
+                    if urls:
+                        return {
+                            'engine': 'google',
+                            'urls': urls[:num_results],
+                            'status': 'success'
+                        }
+                    else:
+                        return {'engine': 'google', 'urls': [], 'status': 'partial'}
+                else:
+                    logger.warning(f"Google search HTTP {response.status}")
+                    return {'engine': 'google', 'urls': [], 'status': 'error'}
+                    
         except Exception as e:
             logger.error(f"Google search error: {str(e)}")
             return {'engine': 'google', 'urls': [], 'status': 'error'}
@@ -120,53 +145,62 @@ class DuckDuckGoSearchEngine(SearchEngine):
         try:
             # Try API first
             api_url = f"https://api.duckduckgo.com/?q={quote(query)}&format=json&no_html=1&skip_disambig=1"
-            async with await self.setup_session() as session:
-                async with session.get(api_url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        urls = []
-                        # Extract from RelatedTopics
-                        topics = data.get('RelatedTopics', [])
-                        for topic in topics[:num_results]:
-                            if 'FirstURL' in topic:
-                                urls.append(topic['FirstURL'])
-                            elif 'Topics' in topic:
-                                for sub in topic['Topics'][:num_results - len(urls)]:
-                                    if 'FirstURL' in sub:
-                                        urls.append(sub['FirstURL'])
-                        
-                        if urls:
-                            return {
-                                'engine': 'duckduckgo_api',
-                                'urls': urls[:num_results],
-                                'status': 'success'
-                            }
+            session = await self.setup_session()
+            async with session.get(api_url) as response:
+                if response.status == 200:
+                    # orjson straight from bytes; DDG also serves this with a JS content type
+                    try:
+                        data = orjson.loads(await response.read())
+                    except orjson.JSONDecodeError:
+                        data = {}  # Fall through to scraping
+                    urls = []
+                    # Extract from RelatedTopics
+                    topics = data.get('RelatedTopics', [])
+                    for topic in topics[:num_results]:
+                        if 'FirstURL' in topic:
+                            urls.append(topic['FirstURL'])
+                        elif 'Topics' in topic:
+                            for sub in topic['Topics'][:num_results - len(urls)]:
+                                if 'FirstURL' in sub:
+                                    urls.append(sub['FirstURL'])
+                    
+                    if urls:
+                        return {
+                            'engine': 'duckduckgo_api',
+                            'urls': urls[:num_results],
+                            'status': 'success'
+                        }
             
             # Fallback to scraping if API yields no URLs
             search_url = f"https://duckduckgo.com/html/?q={quote(query)}"
-            async with await self.setup_session() as session:
-                async with session.get(search_url) as response:
-                    if response.status == 200:
-                        html = await response.text()
-                        soup = BeautifulSoup(html, 'html.parser')
-                        
-                        urls = []
-                        for result in soup.find_all('a', class_='result__a', limit=num_results):
-                            href = result.get('href')
-                            if href:
-                                # Decode DDG URL
-                                if href.startswith('/l/?uddg='):
-                                    from urllib.parse import unquote
-                                    actual_url = unquote(href.split('uddg=')[1].split('&')[0])
-                                    urls.append(actual_url)
-                        
-                        if urls:
-                            return {
-                                'engine': 'duckduckgo_scrape',
-                                'urls': urls[:num_results],
-                                'status': 'success'
-                            }
-                        
+            async with session.get(search_url) as response:
+                if response.status == 200:
+                    html = await response.text()
+                    if LexborHTMLParser is not None:
+                        results = LexborHTMLParser(html).css('a.result__a')[:num_results]
+                        hrefs = [a.attributes.get('href') for a in results]
+                    else:
+                        strainer = SoupStrainer('a', class_='result__a')
+                        soup = BeautifulSoup(html, 'lxml', parse_only=strainer)
+                        results = soup.find_all('a', class_='result__a', limit=num_results)
+                        hrefs = [a.get('href') for a in results]
+                    
+                    urls = []
+                    for href in hrefs:
+                        if href:
+                            # Decode DDG URL
+                            if href.startswith('/l/?uddg='):
+                                # parse_qs already percent-decodes the target URL
+                                actual_url = parse_qs(urlparse(href).query).get('uddg', [''])[0]
+                                urls.append(actual_url)
+                    
+                    if urls:
+                        return {
+                            'engine': 'duckduckgo_scrape',
+                            'urls': urls[:num_results],
+                            'status': 'success'
+                        }
+                    
         except Exception as e:
             logger.error(f"DuckDuckGo search error: {str(e)}")
         
@@ -175,32 +209,57 @@ class DuckDuckGoSearchEngine(SearchEngine):
 class SearchManager:
     """Manages multiple engines with fallback and concurrency"""
     
-    def __init__(self, engines: List[SearchEngine] = None):
+    def __init__(self, engines: List[SearchEngine] = None, session: Optional[aiohttp.ClientSession] = None):
         self.engines = engines or [GoogleSearchEngine(), DuckDuckGoSearchEngine()]
+        self.session = session
+        self._owns_session = False
+    
+    async def setup_session(self) -> aiohttp.ClientSession:
+        """One pooled session shared by every engine without a session of its own"""
+        if not self.session:
+            self.session = create_session(limit_per_host=10)
+            self._owns_session = True
+        for engine in self.engines:
+            if not engine.session:
+                engine.session = self.session
+                engine._owns_session = False
+        return self.session
     
     async def perform_search(self, query: str, num_results: int = 10) -> Dict[str, Any]:
         """
-        Perform search across engines with fallback
+        Perform search across all engines concurrently
         
         Returns:
             Aggregated unique URLs
         """
-        all_urls = set()
+        await self.setup_session()
+        all_urls: Dict[str, None] = {}  # Insertion-ordered set
         used_engines = []
         
-        for engine in self.engines:
-            try:
-                result = await engine.search(query, num_results)
-                used_engines.append(result['engine'])
-                if result['status'] == 'success' and result['urls']:
-                    all_urls.update(result['urls'])
-                    if len(all_urls) >= num_results:
-                        break
-            except Exception as e:
-                logger.error(f"Engine {engine.__class__.__name__} failed: {str(e)}")
-                continue
+        # All engines run concurrently; results are merged in engine priority order
+        tasks = [asyncio.create_task(engine.search(query, num_results)) for engine in self.engines]
+        try:
+            for engine, task in zip(self.engines, tasks):
+                if len(all_urls) >= num_results:
+                    break
+                try:
+                    result = await task
+                    used_engines.append(result['engine'])
+                    if result['status'] == 'success' and result['urls']:
+                        for url in result['urls']:
+                            all_urls.setdefault(url)
+                            if len(all_urls) >= num_results:
+                                break
+                except Exception as e:
+                    logger.error(f"Engine {engine.__class__.__name__} failed: {str(e)}")
+                    continue
+        finally:
+            # Drop engines whose results are no longer needed
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
         
-        unique_urls = list(all_urls)[:num_results]
+        unique_urls = list(all_urls)
         return {
             'query': query,
             'urls': unique_urls,
@@ -213,8 +272,19 @@ class SearchManager:
         """Close all sessions"""
         for engine in self.engines:
             await engine.close_session()
+            if engine.session is self.session:
+                engine.session = None
+        if self.session and self._owns_session:
+            await self.session.close()
+            self.session = None
+            self._owns_session = False
 
-async def search_with_concurrency(queries: List[str], max_concurrent: int = 5, num_results: int = 10) -> List[Dict[str, Any]]:
+async def search_with_concurrency(
+    queries: List[str],
+    max_concurrent: int = 5,
+    num_results: int = 10,
+    manager: Optional[SearchManager] = None
+) -> List[Dict[str, Any]]:
     """
     Perform concurrent searches for multiple queries
     
@@ -222,25 +292,35 @@ async def search_with_concurrency(queries: List[str], max_concurrent: int = 5, n
         queries: List of search queries
         max_concurrent: Max concurrent searches
         num_results: Results per query
+        manager: Shared manager to search with; left open after the searches
         
     Returns:
         List of search results
     """
     semaphore = asyncio.Semaphore(max_concurrent)
-    manager = SearchManager()
+    owns_manager = manager is None
+    if owns_manager:
+        manager = SearchManager()
     
     async def bounded_search(query):
         async with semaphore:
-            return await manager.perform_search(query, num_results)
-    
-    tasks = [bounded_search(q) for q in queries]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+            try:
+                return await manager.perform_search(query, num_results)
+            except Exception as e:
+                # Drop the failed query without cancelling the rest of the group
+                logger.warning(f"Search for {query!r} failed: {e}")
+                return None
     
-    # Close sessions after searches
-    await manager.close_all()
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(bounded_search(q)) for q in queries]
+    finally:
+        # Close sessions after searches
+        if owns_manager:
+            await manager.close_all()
     
-    # Filter out exceptions
-    return [r for r in results if not isinstance(r, Exception)]
+    # Filter out failures
+    return [r for r in (t.result() for t in tasks) if r is not None]
 
 # Example usage
 if __name__ == "__main__":
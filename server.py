@@ -3,21 +3,21 @@
 """
 MCP Scraper Server using FastMCP
 
-FastAPI-based MCP server for web scraping with progressive fallbacks.
+Starlette-based MCP server for web scraping with progressive fallbacks.
 Runs on port 8919, exposes MCP endpoints using FastMCP.
 """
 
 import asyncio
 import json
+import orjson
 import logging
-from typing import Dict, Any, List, Optional, Union
-from fastapi import FastAPI, HTTPException
+from typing import Dict, Any, List, Optional
 from fastmcp import FastMCP
+from fastmcp.exceptions import ToolError
 import uvicorn
 from contextlib import asynccontextmanager
 import base64
 import uuid
-import os
 from urllib.parse import urlparse
 
 
@@ -26,7 +26,7 @@ def is_valid_url(url: str) -> bool:
     Validate that URL is HTTP/HTTPS and has a netloc.
     Prevents access to local file:// or other schemes.
     """
-    if not url or not isinstance(url, str):
+    if not url:
         return False
     try:
         parsed = urlparse(url.strip())
@@ -34,21 +34,105 @@ def is_valid_url(url: str) -> bool:
     except Exception:
         return False
 
+def _dumps(obj: Any) -> str:
+    """Serialize a tool result to a JSON string with orjson"""
+    try:
+        return orjson.dumps(obj).decode()
+    except TypeError:
+        # orjson rejects lone surrogates (e.g. from browser text); json escapes them
+        return json.dumps(obj)
+
 # Import modules
 from search import SearchManager, search_with_concurrency
-from fallback import FallbackScraper, scrape_multiple
+from fallback import FallbackScraper, scrape_multiple as scrape_many
 
 # Playwright integration
 from playwright.async_api import async_playwright
 
+try:
+    from trafilatura import extract as trafilatura_extract
+except ImportError:
+    trafilatura_extract = None
+
 # Global state
-_sessions: Dict[str, Any] = {}  # Browser sessions
+_sessions: Dict[str, Any] = {}  # Browser sessions: one context + page each
+_current_session_id: Optional[str] = None  # Session the browser tools act on
+_sessions_lock = asyncio.Lock()  # Serializes session create/close so concurrent navigates share one
+_pages_alive = 0  # Open session pages, kept in step with _sessions
 _playwright_instance = None
+_browser = None  # Shared by all sessions
+_browser_lock = asyncio.Lock()
+# Shared for the process lifetime so HTTP pools and browsers are reused across calls
+_search_manager = SearchManager()
+# Navigations after which a session's context is replaced to bound Playwright memory growth
+MAX_NAVIGATIONS_PER_CONTEXT = 20
+# Characters of page text returned by browser_get_text
+MAX_TEXT_CHARS = 2000
+# Body text plus, only when it exceeds the limit, the page HTML for extraction
+_PAGE_TEXT_JS = """(limit) => {
+    const text = document.body ? document.body.innerText : "";
+    const html = limit !== null && text.length > limit ? document.documentElement.outerHTML : null;
+    return {text, html};
+}"""
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-mcp = FastMCP("MCP Scraper Server")
+async def _get_browser():
+    """Return the shared headless browser, launching it on first use"""
+    global _playwright_instance, _browser
+    async with _browser_lock:
+        if not _playwright_instance:
+            _playwright_instance = await async_playwright().start()
+        if not _browser or not _browser.is_connected():
+            _browser = await _playwright_instance.chromium.launch(headless=True)
+    return _browser
+
+# Shared for the process lifetime; scrape tools render on the browser tools' Chromium
+_scraper = FallbackScraper(get_browser=_get_browser)
+
+async def _new_session_page(storage_state: Optional[Dict[str, Any]] = None):
+    """Open a context + page on the shared browser, optionally restoring cookies/storage"""
+    browser = await _get_browser()
+    context = await browser.new_context(viewport={'width': 1920, 'height': 1080}, storage_state=storage_state)
+    page = await context.new_page()
+    return context, page
+
+async def _close_browser():
+    """Close all session contexts, the shared browser and Playwright"""
+    global _playwright_instance, _browser, _current_session_id, _pages_alive
+    for session in _sessions.values():
+        try:
+            await session["context"].close()
+        except Exception as e:
+            logger.warning(f"Closing browser context failed: {e}")
+    _sessions.clear()
+    _current_session_id = None
+    _pages_alive = 0
+    if _browser:
+        await _browser.close()
+        _browser = None
+    if _playwright_instance:
+        await _playwright_instance.stop()
+        _playwright_instance = None
+
+@asynccontextmanager
+async def lifespan(server):
+    """Launch the shared browser at startup and tear it down on shutdown"""
+    try:
+        await _get_browser()
+    except Exception as e:
+        # Non-browser tools still work; browser tools retry the launch lazily
+        logger.warning(f"Browser launch at startup failed: {e}")
+    try:
+        yield
+    finally:
+        await _close_browser()
+        await _search_manager.close_all()
+        await _scraper.close_session()
+        await _scraper.close_playwright()
+
+mcp = FastMCP("MCP Scraper Server", lifespan=lifespan)
 
 @mcp.tool()
 async def search_query(
@@ -58,10 +142,8 @@ async def search_query(
     """
     Perform search using Google and DuckDuckGo with fallbacks, returns list of URLs
     """
-    manager = SearchManager()
-    result = await manager.perform_search(query, num_results)
-    await manager.close_all()
-    return json.dumps(result)
+    result = await _search_manager.perform_search(query, num_results)
+    return _dumps(result)
 
 @mcp.tool()
 async def search_multiple(
@@ -72,8 +154,8 @@ async def search_multiple(
     """
     Concurrent search for multiple queries
     """
-    results = await search_with_concurrency(queries, max_concurrent, num_results)
-    return json.dumps(results)
+    results = await search_with_concurrency(queries, max_concurrent, num_results, manager=_search_manager)
+    return _dumps(results)
 
 @mcp.tool()
 async def scrape_url(
@@ -84,13 +166,10 @@ async def scrape_url(
     Scrape a single URL with progressive fallback chain
     """
     if not is_valid_url(url):
-        raise HTTPException(status_code=400, detail="Only HTTP/HTTPS URLs are allowed. Local file access (file:///) and other schemes are prohibited for security.")
+        raise ToolError("Only HTTP/HTTPS URLs are allowed. Local file access (file:///) and other schemes are prohibited for security.")
     
-    scraper = FallbackScraper(max_retries=max_retries)
-    result = await scraper.scrape_with_fallback(url)
-    await scraper.close_session()
-    await scraper.close_playwright()
-    return json.dumps(result)
+    result = await _scraper.scrape_with_fallback(url, max_retries=max_retries)
+    return _dumps(result)
 
 @mcp.tool()
 async def scrape_multiple(
@@ -102,10 +181,10 @@ async def scrape_multiple(
     """
     invalid_urls = [u for u in urls if not is_valid_url(u)]
     if invalid_urls:
-        raise HTTPException(status_code=400, detail=f"Only HTTP/HTTPS URLs are allowed. Invalid URLs: {invalid_urls[:3]}... Local file access (file:///) and other schemes are prohibited for security.")
+        raise ToolError(f"Only HTTP/HTTPS URLs are allowed. Invalid URLs: {invalid_urls[:3]}... Local file access (file:///) and other schemes are prohibited for security.")
     
-    results = await scrape_multiple(urls, max_concurrent)
-    return json.dumps(results)
+    results = await scrape_many(urls, max_concurrent, scraper=_scraper)
+    return _dumps(results)
 
 @mcp.tool()
 async def extract_content(
@@ -117,14 +196,16 @@ async def extract_content(
     """
     # Guardrail: limit input size to prevent abuse
     if len(html) > 5000000:  # 5MB
-        raise HTTPException(status_code=400, detail="HTML input too large. Maximum 5MB allowed.")
+        raise ToolError("HTML input too large. Maximum 5MB allowed.")
     
     if url and not is_valid_url(url):
-        raise HTTPException(status_code=400, detail="If provided, URL must be HTTP/HTTPS.")
+        raise ToolError("If provided, URL must be HTTP/HTTPS.")
+    
+    if trafilatura_extract is None:
+        return "Extraction failed: Trafilatura is not installed"
     
     try:
-        from trafilatura import extract
-        content = extract(html, url=url, favor_precision=True, include_formatting=False)
+        content = trafilatura_extract(html, url=url, favor_precision=True, include_formatting=False)
         if content:
             return content
         else:
@@ -140,24 +221,43 @@ async def browser_navigate(
     Navigate to URL in browser session (creates if none)
     """
     if not is_valid_url(url):
-        raise HTTPException(status_code=400, detail="Only HTTP/HTTPS URLs are allowed. Local file access (file:///) and other schemes are prohibited for security.")
-    
-    global _sessions, _playwright_instance
-    if not _playwright_instance:
-        _playwright_instance = await async_playwright().start()
-    
-    if not any(s for s in _sessions.values() if s.get("page")):
-        # Create new session
-        browser = await _playwright_instance.chromium.launch(headless=True)
-        context = await browser.new_context(viewport={'width': 1920, 'height': 1080})
-        page = await context.new_page()
-        session_id = str(uuid.uuid4())
-        _sessions[session_id] = {"browser": browser, "context": context, "page": page}
+        raise ToolError("Only HTTP/HTTPS URLs are allowed. Local file access (file:///) and other schemes are prohibited for security.")
     
-    session_id = list(_sessions.keys())[-1]
-    page = _sessions[session_id]["page"]
+    global _sessions, _current_session_id, _pages_alive
+    async with _sessions_lock:
+        if _pages_alive == 0:
+            # Create new session: a fresh context on the shared browser
+            context, page = await _new_session_page()
+            session_id = str(uuid.uuid4())
+            _sessions[session_id] = {"context": context, "page": page, "nav_count": 0}
+            _current_session_id = session_id
+            _pages_alive += 1
+        
+        session = _sessions[_current_session_id]
+        session["nav_count"] += 1
+        if session["nav_count"] > MAX_NAVIGATIONS_PER_CONTEXT:
+            # Recycle the long-lived context, carrying cookies/storage over;
+            # the replacement is opened before the old context is closed
+            old_context = session["context"]
+            try:
+                state = await old_context.storage_state()
+                session["context"], session["page"] = await _new_session_page(state)
+            except Exception:
+                # Drop the broken session so the next navigate starts a fresh one
+                _sessions.pop(_current_session_id)
+                _pages_alive -= 1
+                _current_session_id = next(reversed(_sessions), None)
+                raise
+            finally:
+                try:
+                    await old_context.close()
+                except Exception as e:
+                    logger.warning(f"Closing browser context failed: {e}")
+            session["nav_count"] = 1
+        page = session["page"]
     await page.goto(url, wait_until="domcontentloaded")
-    text_preview = (await page.text_content("body"))[:500] if await page.text_content("body") else ""
+    body = await page.text_content("body") or ""
+    text_preview = body[:500]
     return f"Navigated to {url}. Preview: {text_preview}"
 
 @mcp.tool()
@@ -170,8 +270,7 @@ async def browser_click(
     global _sessions
     if not _sessions:
         return "No browser session. Navigate first."
-    session_id = list(_sessions.keys())[-1]
-    page = _sessions[session_id]["page"]
+    page = _sessions[_current_session_id]["page"]
     await page.click(selector)
     return f"Clicked {selector}"
 
@@ -184,18 +283,17 @@ async def browser_evaluate(
     """
     # Guardrail against prompt injection and overly complex scripts
     if len(script) > 10000:
-        raise HTTPException(status_code=400, detail="Script too long. Maximum 10k characters allowed to prevent abuse.")
+        raise ToolError("Script too long. Maximum 10k characters allowed to prevent abuse.")
     
     # Basic sanitization: remove potential injection attempts (simplistic)
     script = script.strip()
     if script.startswith('//') or 'prompt(' in script.lower() or 'alert(' in script.lower():
-        raise HTTPException(status_code=400, detail="Script contains potentially malicious patterns. Use safe JS only.")
+        raise ToolError("Script contains potentially malicious patterns. Use safe JS only.")
     
     global _sessions
     if not _sessions:
         return "No browser session."
-    session_id = list(_sessions.keys())[-1]
-    page = _sessions[session_id]["page"]
+    page = _sessions[_current_session_id]["page"]
     result = await page.evaluate(script)
     return f"Eval result: {result}"
 
@@ -210,15 +308,13 @@ async def browser_screenshot(
     global _sessions
     if not _sessions:
         return "No browser session."
-    session_id = list(_sessions.keys())[-1]
-    page = _sessions[session_id]["page"]
+    page = _sessions[_current_session_id]["page"]
+    # Playwright returns the PNG bytes directly when no path is given
     if selector:
-        await page.locator(selector).screenshot(path=f"{name}.png")
+        png = await page.locator(selector).screenshot()
     else:
-        await page.screenshot(path=f"{name}.png", full_page=True)
-    with open(f"{name}.png", "rb") as f:
-        encoded = base64.b64encode(f.read()).decode()
-    os.remove(f"{name}.png")
+        png = await page.screenshot(full_page=True)
+    encoded = base64.b64encode(png).decode("ascii")
     return f"data:image/png;base64,{encoded}"
 
 @mcp.tool()
@@ -229,39 +325,60 @@ async def browser_get_text() -> str:
     global _sessions
     if not _sessions:
         return "No browser session."
-    session_id = list(_sessions.keys())[-1]
-    page = _sessions[session_id]["page"]
-    text = await page.text_content("body")
+    page = _sessions[_current_session_id]["page"]
+    # One round-trip; the HTML is only serialized when there is something to clean
+    limit = MAX_TEXT_CHARS if trafilatura_extract is not None else None
+    data = await page.evaluate(_PAGE_TEXT_JS, limit)
+    text = data["text"]
+    html = data["html"]
     # Clean with Trafilatura if possible
-    try:
-        from trafilatura import extract
-        html = await page.content()
-        cleaned = extract(html, include_formatting=False)
-        if cleaned:
-            text = cleaned
-    except:
-        pass
-    return text[:2000]  # Limit for tokens
+    if html:
+        try:
+            cleaned = trafilatura_extract(html, include_formatting=False)
+            if cleaned:
+                text = cleaned
+        except:
+            pass
+    return text[:MAX_TEXT_CHARS]  # Limit for tokens
 
 @mcp.tool()
 async def browser_close() -> str:
     """
     Close current browser session
     """
-    global _sessions
-    if _sessions:
-        session_id = list(_sessions.keys())[-1]
-        await _sessions[session_id]["browser"].close()
-        del _sessions[session_id]
+    global _sessions, _current_session_id, _pages_alive
+    async with _sessions_lock:
+        if _sessions:
+            session = _sessions.pop(_current_session_id)
+            _pages_alive -= 1
+            # Fall back to the most recently created remaining session
+            _current_session_id = next(reversed(_sessions), None)
+            await session["context"].close()
     return "Session closed"
 
+from starlette.middleware import Middleware
+from starlette.middleware.gzip import GZipMiddleware
 from starlette.responses import JSONResponse
 
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson"""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
 @mcp.custom_route("/health", methods=["GET"])
 async def health(request):
-    return JSONResponse({"status": "healthy", "sessions": len(_sessions)})
+    return ORJSONResponse({"status": "healthy", "sessions": len(_sessions)})
 
-app = mcp.http_app(path="/mcp")
+# Plain JSON tool responses instead of SSE, so GZipMiddleware can compress large
+# results (Starlette never compresses text/event-stream)
+app = mcp.http_app(
+    path="/mcp",
+    json_response=True,
+    middleware=[Middleware(GZipMiddleware, minimum_size=1024)],
+)
 
 if __name__ == "__main__":
+    # uvicorn[standard] installs uvloop + httptools; loop/http "auto" selects them
     uvicorn.run(app, host="0.0.0.0", port=8919, log_level="info")
@@ -9,7 +9,7 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 from server import app, search_with_concurrency  # Import missing function
-from search import SearchManager
+from search import SearchEngine, SearchManager
 from fallback import FallbackScraper
 import json
 from httpx import AsyncClient
@@ -229,6 +229,68 @@ class TestModuleIntegration:
         await scraper.close_session()
         await scraper.close_playwright()
 
+    @pytest.mark.asyncio
+    async def test_search_manager_dedup_order(self):
+        """Merged URLs keep engine order, drop duplicates and stop at num_results"""
+        class StaticEngine(SearchEngine):
+            def __init__(self, name, urls):
+                super().__init__()
+                self.name = name
+                self.urls = urls
+
+            async def search(self, query, num_results=10):
+                return {"engine": self.name, "urls": self.urls, "status": "success"}
+
+        manager = SearchManager(engines=[
+            StaticEngine("a", ["https://a/1", "https://a/2"]),
+            StaticEngine("b", ["https://a/2", "https://b/1", "https://b/2"]),
+            StaticEngine("c", ["https://c/1"]),
+        ])
+        result = await manager.perform_search("q", num_results=3)
+        assert result["urls"] == ["https://a/1", "https://a/2", "https://b/1"]
+        assert result["engines_used"] == ["a", "b"]
+        await manager.close_all()
+
+    @pytest.mark.asyncio
+    async def test_search_with_concurrency_drops_failures(self):
+        """A failing query is dropped without cancelling the others"""
+        class FlakyManager(SearchManager):
+            async def perform_search(self, query, num_results=10):
+                if query == "bad":
+                    raise RuntimeError("boom")
+                await asyncio.sleep(0)
+                return {"query": query, "urls": []}
+
+        manager = FlakyManager(engines=[])
+        results = await search_with_concurrency(["a", "bad", "b"], max_concurrent=2, manager=manager)
+        assert [r["query"] for r in results] == ["a", "b"]
+        await manager.close_all()
+
+    def test_redirect_site_check(self):
+        """www/locale redirects stay on site; other hosts count as bot redirects"""
+        from fallback import _left_site
+        assert not _left_site("https://example.com/a", "https://www.example.com/a")
+        assert not _left_site("https://www.example.com/", "https://en.example.com/")
+        assert _left_site("https://example.com/", "https://consent.google.com/")
+
+    def test_looks_thin(self):
+        """Speculative headless runs only for pages without enough visible text"""
+        from fallback import _looks_thin
+        words = "word " * 300
+        assert not _looks_thin(f'<html><body><div class="content"><p>{words}</p></div></body></html>')
+        assert _looks_thin(f'<html><head><script>var s = "{words}";</script></head><body><div id="app"></div></body></html>')
+        assert _looks_thin(f'<html><body><!-- {words} --><p>short</p></body></html>')
+
+    def test_retry_delay_headers(self):
+        """Rate-limit headers drive the HTTP retry backoff"""
+        scraper = FallbackScraper(timeout=30)
+        assert scraper._retry_delay({"Retry-After": "5"}) == 5.0
+        assert scraper._retry_delay({"Retry-After": "3600"}) == 30
+        assert scraper._retry_delay({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0.0
+        assert scraper._retry_delay({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "12"}) == 12.0
+        assert scraper._retry_delay({"X-RateLimit-Remaining": "7", "X-RateLimit-Reset": "12"}) is None
+        assert scraper._retry_delay({}) is None
+
     @pytest.mark.asyncio
     async def test_list_tools(self):
         """Test listing tools via server (mock)"""